@@ -23,6 +23,7 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
         'created_at',
     )
+    list_select_related = ('author', 'location', 'category')
     search_fields = ('title',)
     list_editable = ('is_published',)
     empty_value_display = 'Не задано'
@@ -60,3 +61,4 @@ class CommentAdmin(admin.ModelAdmin):
         'post',
         'pub_date',
     )
+    list_select_related = ('author', 'post__author')
@@ -0,0 +1,33 @@
+from hashlib import md5
+
+from django.core.cache import cache
+
+# The default cache is per process: signal invalidation only reaches the
+# worker that saved the object, other workers catch up when entries expire.
+CATEGORY_CACHE_KEY = 'blog:category:{slug}'
+CATEGORY_CACHE_TIMEOUT = 60
+POSTS_VERSION_CACHE_KEY = 'blog:posts:version'
+POSTS_CACHE_KEY = 'blog:posts:{name}:{version}:{query}'
+POSTS_COUNT_CACHE_TIMEOUT = 60
+POSTS_PAGE_CACHE_TIMEOUT = 30
+
+
+def get_category_cache_key(slug):
+    return CATEGORY_CACHE_KEY.format(slug=slug)
+
+
+def get_posts_cache_key(name, posts):
+    return POSTS_CACHE_KEY.format(
+        name=name,
+        version=cache.get_or_set(POSTS_VERSION_CACHE_KEY, 0, None),
+        query=md5(
+            str(posts.query).encode(), usedforsecurity=False
+        ).hexdigest()
+    )
+
+
+def expire_posts():
+    try:
+        cache.incr(POSTS_VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(POSTS_VERSION_CACHE_KEY, 1, None)
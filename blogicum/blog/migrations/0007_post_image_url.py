@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-14 04:37
+
+from django.db import migrations, models
+
+
+def fill_image_url(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    for post in Post.objects.exclude(image='').only('image'):
+        Post.objects.filter(pk=post.pk).update(image_url=post.image.url)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_url',
+            field=models.CharField(blank=True, editable=False, max_length=500, verbose_name='Адрес фото'),
+        ),
+        migrations.RunPython(fill_image_url, migrations.RunPython.noop),
+    ]
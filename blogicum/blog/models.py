@@ -89,12 +89,38 @@ class Post(PublishedModel):
         verbose_name='Категория'
     )
     image = models.ImageField('Фото', blank=True)
+    image_url = models.CharField(
+        'Адрес фото',
+        max_length=500,
+        blank=True,
+        editable=False,
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('-pub_date',),
+                name='post_pub_date_published_idx',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=('category', '-pub_date'),
+                name='post_category_pub_date_idx',
+            ),
+            models.Index(
+                fields=('author', '-pub_date'),
+                name='post_author_pub_date_idx',
+            ),
+        )
 
     def __str__(self):
         return (f'{self.author}'
@@ -103,6 +129,15 @@ class Post(PublishedModel):
     def get_absolute_url(self):
         return reverse('blog:post_detail', kwargs={'post_id': self.pk})
 
+    def save(self, *args, **kwargs):
+        if self.image and not self.image._committed:
+            self.image.save(self.image.name, self.image.file, save=False)
+        self.image_url = self.image.url if self.image else ''
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'image' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'image_url'}
+        super().save(*args, **kwargs)
+
 
 class Comment(models.Model):
     text = models.TextField('Текст')
@@ -0,0 +1,110 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, QuerySet
+from django.db.models.functions import Greatest
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .caching import expire_posts, get_category_cache_key
+from .models import Category, Comment, Location, Post, User
+
+
+def expire_now_and_on_commit(expire):
+    # Expiring now keeps the writing transaction from reading stale
+    # entries; expiring again on commit drops anything another request
+    # cached from the pre-commit rows in between.
+    expire()
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(expire)
+
+
+def shift_comment_count(post_id, delta):
+    Post.objects.filter(pk=post_id).update(
+        comment_count=Greatest(F('comment_count') + delta, 0)
+    )
+
+
+@receiver(pre_save, sender=Comment)
+def remember_comment_post(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance._previous_post_id = (
+        Comment.objects.filter(pk=instance.pk)
+        .values_list('post_id', flat=True).first()
+        if instance.pk is not None else None
+    )
+
+
+@receiver(post_save, sender=Comment)
+def sync_comment_count(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if created:
+        shift_comment_count(instance.post_id, 1)
+    elif previous_post_id not in (None, instance.post_id):
+        shift_comment_count(previous_post_id, -1)
+        shift_comment_count(instance.post_id, 1)
+
+
+def get_deleted_post_ids(origin):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if not issubclass(model, User):
+        return set()
+    if not hasattr(origin, '_deleted_post_ids'):
+        users = origin if isinstance(origin, QuerySet) else (origin,)
+        origin._deleted_post_ids = set(
+            Post.objects.filter(author__in=users)
+            .values_list('pk', flat=True)
+        )
+    return origin._deleted_post_ids
+
+
+@receiver(post_delete, sender=Comment)
+def decrease_comment_count(sender, instance, origin, **kwargs):
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if issubclass(model, Post):
+        return
+    if instance.post_id in get_deleted_post_ids(origin):
+        return
+    shift_comment_count(instance.post_id, -1)
+
+
+@receiver(pre_save, sender=Post)
+def fill_loaded_image_url(sender, instance, raw=False, **kwargs):
+    if raw:
+        instance.image_url = instance.image.url if instance.image else ''
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def expire_post_feeds(sender, **kwargs):
+    expire_now_and_on_commit(expire_posts)
+
+
+def forget_category_slug(slug):
+    expire_now_and_on_commit(
+        lambda: cache.delete(get_category_cache_key(slug))
+    )
+
+
+@receiver(pre_save, sender=Category)
+def forget_previous_category_slug(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    slug = (Category.objects.filter(pk=instance.pk)
+            .values_list('slug', flat=True).first())
+    if slug is not None and slug != instance.slug:
+        forget_category_slug(slug)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def forget_category(sender, instance, **kwargs):
+    forget_category_slug(instance.slug)
@@ -1,42 +1,148 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from datetime import datetime, timezone as dt_timezone
+
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Count
-from django.shortcuts import get_object_or_404, redirect
+from django.db.models import Exists, OuterRef, Q, QuerySet
+from django.http import Http404
+from django.shortcuts import redirect
 from django.urls import reverse, reverse_lazy
 from django.utils import timezone
+from django.utils.functional import cached_property
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView, FormView
 )
 
+from .caching import (
+    CATEGORY_CACHE_TIMEOUT, POSTS_COUNT_CACHE_TIMEOUT,
+    POSTS_PAGE_CACHE_TIMEOUT, get_category_cache_key, get_posts_cache_key
+)
 from .forms import CommentForm, CreatePostForm, ProfileForm
 from .models import Category, Comment, Post, User
 
 
 PAGINATE_BY = 10
+COMMENTS_PAGINATE_BY = 20
+MAX_POST_ID = 2 ** 63 - 1
+POST_CARD_FIELDS = (
+    'id', 'title', 'text', 'pub_date', 'image_url', 'is_published',
+    'comment_count', 'author__username', 'category__slug',
+    'category__title', 'category__is_published', 'location__name',
+    'location__is_published',
+)
+
+
+def get_pub_date_cutoff():
+    return timezone.now().replace(second=0, microsecond=0)
+
+
+class CachedCountPaginator(Paginator):
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        return cache.get_or_set(
+            get_posts_cache_key('count', self.object_list),
+            self.object_list.count,
+            POSTS_COUNT_CACHE_TIMEOUT
+        )
+
+
+class KeysetPage:
+
+    def __init__(self, posts, cursor, per_page=PAGINATE_BY):
+        posts = posts.order_by('-pub_date', '-id')
+        position = self.decode_cursor(cursor)
+        if position is not None:
+            pub_date, pk = position
+            posts = posts.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )
+        rows = cache.get_or_set(
+            get_posts_cache_key(f'keyset:{per_page}', posts),
+            lambda: list(posts[:per_page + 1]),
+            POSTS_PAGE_CACHE_TIMEOUT
+        )
+        self.object_list = rows[:per_page]
+        self._has_next = len(rows) > per_page
+        self._has_previous = position is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if not self._has_next:
+            return None
+        return self.encode_cursor(self.object_list[-1])
+
+    @staticmethod
+    def encode_cursor(post):
+        return urlsafe_b64encode(
+            f'{post.pub_date.isoformat()},{post.pk}'.encode()
+        ).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        if not cursor:
+            return None
+        try:
+            pub_date, pk = (
+                urlsafe_b64decode(cursor.encode()).decode().split(',')
+            )
+            pub_date, pk = datetime.fromisoformat(pub_date), int(pk)
+            if timezone.is_naive(pub_date) or abs(pk) > MAX_POST_ID:
+                return None
+            return pub_date.astimezone(dt_timezone.utc), pk
+        except (BinasciiError, OverflowError, UnicodeError, ValueError):
+            return None
 
 
 def get_page_obj(posts, request, paginate_by=PAGINATE_BY):
-    return Paginator(posts, paginate_by).get_page(request.GET.get('page'))
+    return CachedCountPaginator(posts, paginate_by).get_page(
+        request.GET.get('page')
+    )
 
 
 def get_published_posts(posts=Post.objects, select_related=True,
-                        published_check=True, add_comment=True):
+                        published_check=True, only_card_fields=False):
     if select_related:
         posts = posts.select_related('location', 'category', 'author')
+    if only_card_fields:
+        posts = posts.only(*POST_CARD_FIELDS)
     if published_check:
         posts = posts.filter(
-            is_published=True, category__is_published=True,
-            pub_date__lte=timezone.now())
-    if add_comment:
-        posts = (posts.annotate(comment_count=Count('comments'))
-                 .order_by(*Post._meta.ordering))
+            Exists(Category.objects.filter(
+                pk=OuterRef('category_id'), is_published=True
+            )),
+            is_published=True, pub_date__lte=get_pub_date_cutoff())
     return posts
 
 
 class OnlyAuthorMixin(UserPassesTestMixin):
 
+    def get_object(self, queryset=None):
+        if not hasattr(self, '_cached_object'):
+            self._cached_object = super().get_object(queryset)
+        return self._cached_object
+
     def test_func(self):
-        return self.get_object().author == self.request.user
+        return self.get_object().author_id == self.request.user.pk
 
 
 class PostActionMixin:
@@ -52,7 +158,13 @@ class Index(ListView):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = PAGINATE_BY
-    queryset = get_published_posts()
+
+    def get_queryset(self):
+        return get_published_posts(only_card_fields=True)
+
+    def paginate_queryset(self, queryset, page_size):
+        page = KeysetPage(queryset, self.request.GET.get('cursor'), page_size)
+        return None, page, page.object_list, page.has_other_pages()
 
 
 class PostDetail(FormView, DetailView):
@@ -68,15 +180,19 @@ class PostDetail(FormView, DetailView):
             return post
         return super().get_object(
             queryset=get_published_posts(
-                select_related=False,
-                add_comment=False
+                select_related=False
             )
         )
 
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
-            comments=self.object.comments.select_related('author'),
+            comments=Paginator(
+                self.object.comments.select_related('author').only(
+                    'id', 'text', 'pub_date', 'author__id', 'author__username'
+                ).order_by('pub_date', 'id'),
+                COMMENTS_PAGINATE_BY
+            ).get_page(self.request.GET.get('cpage')),
             form=self.get_form()
         )
 
@@ -91,12 +207,21 @@ class CategoryPosts(DetailView):
     def get_queryset(self):
         return super().get_queryset().filter(is_published=True)
 
+    def get_object(self, queryset=None):
+        key = get_category_cache_key(self.kwargs[self.slug_url_kwarg])
+        category = cache.get(key)
+        if category is None:
+            category = super().get_object(queryset)
+            cache.set(key, category, CATEGORY_CACHE_TIMEOUT)
+        return category
+
     def get_context_data(self, **kwargs):
         return super().get_context_data(
             **kwargs,
             page_obj=get_page_obj(
                 get_published_posts(
-                    super().get_context_data()['category'].posts
+                    self.object.posts,
+                    only_card_fields=True
                 ),
                 self.request
             )
@@ -117,7 +242,7 @@ class EditPost(LoginRequiredMixin, OnlyAuthorMixin,
 
     def dispatch(self, request, *args, **kwargs):
         post = self.get_object()
-        if post.author != request.user:
+        if post.author_id != request.user.pk:
             return redirect('blog:post_detail', post.id)
         return super().dispatch(request, *args, **kwargs)
 
@@ -138,7 +263,17 @@ class CommentAction:
     pk_url_kwarg = 'comment_id'
 
     def get_success_url(self):
-        return reverse('blog:post_detail', args=[self.kwargs['post_id']])
+        comment = self.object
+        position = Comment.objects.filter(
+            Q(pub_date__lt=comment.pub_date)
+            | Q(pub_date=comment.pub_date, pk__lt=comment.pk),
+            post_id=comment.post_id
+        ).count()
+        return '{}?cpage={}#comment_{}'.format(
+            reverse('blog:post_detail', args=[self.kwargs['post_id']]),
+            position // COMMENTS_PAGINATE_BY + 1,
+            comment.pk
+        )
 
 
 class CreateComment(LoginRequiredMixin, CommentAction, CreateView):
@@ -146,7 +281,9 @@ class CreateComment(LoginRequiredMixin, CommentAction, CreateView):
 
     def form_valid(self, form):
         form.instance.author = self.request.user
-        form.instance.post = get_object_or_404(Post, pk=self.kwargs['post_id'])
+        if not Post.objects.filter(pk=self.kwargs['post_id']).exists():
+            raise Http404
+        form.instance.post_id = self.kwargs['post_id']
         return super().form_valid(form)
 
 
@@ -174,7 +311,8 @@ class Profile(DetailView):
             page_obj=get_page_obj(
                 get_published_posts(
                     self.object.posts,
-                    published_check=(self.request.user != self.object)
+                    published_check=(self.request.user != self.object),
+                    only_card_fields=True
                 ),
                 self.request
             )
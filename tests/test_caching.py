@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from blog.caching import POSTS_VERSION_CACHE_KEY, get_category_cache_key
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.django_db
+def test_posts_version_bumps_again_on_commit(
+        mixer, user, django_capture_on_commit_callbacks):
+    post = mixer.blend('blog.Post', author=user)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.delete()
+        version_before_commit = cache.get(POSTS_VERSION_CACHE_KEY)
+    assert cache.get(POSTS_VERSION_CACHE_KEY) > version_before_commit
+
+
+@pytest.mark.django_db
+def test_unpublished_category_is_not_served_from_cache(
+        client, published_category):
+    url = f'/category/{published_category.slug}/'
+    assert client.get(url).status_code == 200
+    published_category.is_published = False
+    published_category.save()
+    assert client.get(url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_renamed_category_drops_old_slug(client, published_category):
+    old_slug = published_category.slug
+    assert client.get(f'/category/{old_slug}/').status_code == 200
+    assert cache.get(get_category_cache_key(old_slug)) is not None
+    published_category.slug = f'{old_slug}-renamed'
+    published_category.save()
+    assert cache.get(get_category_cache_key(old_slug)) is None
+    assert client.get(f'/category/{old_slug}/').status_code == 404
+    assert client.get(
+        f'/category/{published_category.slug}/'
+    ).status_code == 200
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('page', ['category', 'profile'])
+def test_cached_post_counts_follow_post_changes(
+        client, mixer, user, published_category, page):
+    def num_pages():
+        url = (f'/category/{published_category.slug}/' if page == 'category'
+               else f'/profile/{user.username}/')
+        return client.get(url).context['page_obj'].paginator.num_pages
+
+    def new_post():
+        return mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            is_published=True, pub_date=timezone.now() - timedelta(days=1)
+        )
+
+    posts = [new_post() for _ in range(N_PER_PAGE)]
+    assert num_pages() == 1
+    new_post()
+    assert num_pages() == 2
+    posts[0].is_published = False
+    posts[0].save()
+    assert num_pages() == 1
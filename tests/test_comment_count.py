@@ -0,0 +1,96 @@
+import pytest
+from django.core import serializers
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _comment_counts(*posts):
+    for post in posts:
+        post.refresh_from_db()
+    return [post.comment_count for post in posts]
+
+
+@pytest.fixture
+def two_posts(mixer, user):
+    return mixer.cycle(2).blend('blog.Post', author=user, comment_count=0)
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_created_comments(mixer, user, two_posts):
+    first, second = two_posts
+    mixer.cycle(3).blend('blog.Comment', author=user, post=first)
+    assert _comment_counts(first, second) == [3, 0]
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_deleted_comments(mixer, user, two_posts):
+    first, second = two_posts
+    comments = mixer.cycle(2).blend('blog.Comment', author=user, post=first)
+    comments[0].delete()
+    assert _comment_counts(first, second) == [1, 0]
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_reassigned_comments(mixer, user, two_posts):
+    first, second = two_posts
+    comment = mixer.blend('blog.Comment', author=user, post=first)
+    comment.text = 'Изменённый текст'
+    comment.save()
+    assert _comment_counts(first, second) == [1, 0]
+    comment.post = second
+    comment.save()
+    assert _comment_counts(first, second) == [0, 1]
+
+
+@pytest.mark.django_db
+def test_post_delete_skips_comment_count_updates(
+        mixer, user, two_posts, django_assert_max_num_queries):
+    first, second = two_posts
+    mixer.cycle(50).blend('blog.Comment', author=user, post=first)
+    with django_assert_max_num_queries(10):
+        first.delete()
+    assert _comment_counts(second) == [0]
+
+
+@pytest.mark.django_db
+def test_user_delete_keeps_other_comment_counts(
+        mixer, user, another_user, two_posts):
+    first, second = two_posts
+    foreign_post = mixer.blend(
+        'blog.Post', author=another_user, comment_count=0
+    )
+    mixer.cycle(5).blend('blog.Comment', author=another_user, post=first)
+    mixer.cycle(2).blend('blog.Comment', author=user, post=foreign_post)
+    mixer.blend('blog.Comment', author=another_user, post=foreign_post)
+    user.delete()
+    assert _comment_counts(foreign_post) == [1]
+
+
+@pytest.mark.django_db
+def test_loaddata_keeps_dumped_comment_count(
+        mixer, user, two_posts, PostModel):
+    first, _ = two_posts
+    mixer.cycle(3).blend('blog.Comment', author=user, post=first)
+    first.refresh_from_db()
+    dump = serializers.serialize('json', [first, *first.comments.all()])
+    post_id = first.pk
+    first.delete()
+    for obj in serializers.deserialize('json', dump):
+        obj.save()
+    assert PostModel.objects.get(pk=post_id).comment_count == 3
+
+
+@pytest.mark.django_db
+def test_comment_count_does_not_go_below_zero(user, two_posts, CommentModel):
+    first, _ = two_posts
+    CommentModel.objects.bulk_create(
+        [CommentModel(text='Текст', author=user, post=first)]
+    )
+    CommentModel.objects.get().delete()
+    assert _comment_counts(first) == [0]
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+N_COMMENTS_PER_PAGE = 20
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def commented_post(mixer, user):
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category__is_published=True,
+        pub_date=timezone.now() - timedelta(days=1)
+    )
+    mixer.cycle(N_COMMENTS_PER_PAGE + 5).blend(
+        'blog.Comment', author=user, post=post
+    )
+    return post
+
+
+def _shown_comments(response):
+    return response.content.decode().count('name="comment_')
+
+
+@pytest.mark.django_db
+def test_comments_are_paginated(user_client, commented_post):
+    url = f'/posts/{commented_post.id}/'
+    first_page = user_client.get(url)
+    assert _shown_comments(first_page) == N_COMMENTS_PER_PAGE
+    assert '?cpage=2' in first_page.content.decode()
+    second_page = user_client.get(url, {'cpage': 2})
+    assert _shown_comments(second_page) == 5
+    assert '?cpage=1' in second_page.content.decode()
+
+
+@pytest.mark.django_db
+def test_new_comment_redirects_to_its_page(user_client, commented_post):
+    response = user_client.post(
+        f'/posts/{commented_post.id}/comment/', {'text': 'Новый комментарий'}
+    )
+    comment = commented_post.comments.latest('pk')
+    assert response.url == (
+        f'/posts/{commented_post.id}/?cpage=2#comment_{comment.id}'
+    )
+    page = user_client.get(response.url)
+    assert f'name="comment_{comment.id}"' in page.content.decode()
+
+
+@pytest.mark.django_db
+def test_edited_comment_redirects_to_its_page(user_client, commented_post):
+    comment = commented_post.comments.earliest('pk')
+    response = user_client.post(
+        f'/posts/{commented_post.id}/edit_comment/{comment.id}',
+        {'text': 'Изменённый комментарий'}
+    )
+    assert response.url == (
+        f'/posts/{commented_post.id}/?cpage=1#comment_{comment.id}'
+    )
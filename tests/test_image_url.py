@@ -0,0 +1,78 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core import serializers
+from django.core.cache import cache
+from django.core.files.images import ImageFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _image_file(name):
+    img_io = BytesIO()
+    Image.new('RGB', (10, 10)).save(img_io, 'JPEG')
+    img_io.seek(0)
+    return ImageFile(img_io, name=name)
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+@pytest.fixture
+def post(mixer, user):
+    return mixer.blend('blog.Post', author=user, image='')
+
+
+def _post_writes(queries):
+    return [
+        query['sql'] for query in queries
+        if query['sql'].startswith(('INSERT INTO "blog_post"',
+                                    'UPDATE "blog_post"'))
+    ]
+
+
+@pytest.mark.django_db
+def test_image_upload_sets_image_url(post):
+    post.image = _image_file('first.jpg')
+    with CaptureQueriesContext(connection) as queries:
+        post.save()
+    assert len(_post_writes(queries)) == 1
+    post.refresh_from_db()
+    assert post.image_url == post.image.url
+    assert post.image_url.endswith('first.jpg')
+
+
+@pytest.mark.django_db
+def test_image_replace_updates_image_url(post):
+    post.image = _image_file('first.jpg')
+    post.save()
+    post.image = _image_file('second.jpg')
+    post.save(update_fields=['image'])
+    post.refresh_from_db()
+    assert post.image_url == post.image.url
+    assert post.image_url.endswith('second.jpg')
+
+
+@pytest.mark.django_db
+def test_loaddata_fills_image_url(post, PostModel):
+    post.image = _image_file('first.jpg')
+    post.save()
+    dump = serializers.serialize('json', [post], fields=[
+        field.name for field in PostModel._meta.fields
+        if field.name != 'image_url'
+    ])
+    PostModel.objects.filter(pk=post.pk).update(image_url='')
+    for obj in serializers.deserialize('json', dump):
+        obj.save()
+    post.refresh_from_db()
+    assert post.image_url == post.image.url
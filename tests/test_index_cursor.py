@@ -0,0 +1,69 @@
+from base64 import urlsafe_b64encode
+from datetime import timedelta
+from urllib.parse import quote
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def _encode(raw):
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+@pytest.fixture
+def index_posts(mixer, user, published_category):
+    pub_dates = (
+        timezone.now() - timedelta(hours=hours // 2)
+        for hours in range(2, N_PER_PAGE * 2 + 7)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=pub_dates
+    )
+
+
+@pytest.mark.django_db
+def test_index_pages_follow_each_other(client, index_posts, PostModel):
+    expected = list(PostModel.objects.order_by('-pub_date', '-id'))
+    seen = []
+    response = client.get('/')
+    assert response.context['page_obj'].has_previous() is False
+    while True:
+        page = response.context['page_obj']
+        assert len(page) <= N_PER_PAGE
+        seen.extend(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+        assert f'?cursor={quote(cursor)}' in response.content.decode()
+        response = client.get('/', {'cursor': cursor})
+        assert response.context['page_obj'].has_previous()
+    assert seen == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('cursor', [
+    _encode('9999-12-31T23:59:59-23:00,1'),
+    _encode('0001-01-01T00:00:00+05:00,1'),
+    _encode('2020-01-01,1'),
+    _encode('2020-01-01T00:00:00+00:00,' + '9' * 30),
+    _encode('not a cursor'),
+    'not base64!',
+])
+@pytest.mark.filterwarnings('error::RuntimeWarning')
+def test_bad_cursor_falls_back_to_first_page(client, index_posts, cursor):
+    response = client.get('/', {'cursor': cursor})
+    assert response.status_code == 200
+    assert list(response.context['page_obj']) == list(
+        client.get('/').context['page_obj']
+    )